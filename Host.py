@@ -1,5 +1,4 @@
 from simulator.SimulatedEntity import SimulatedEntity
-from simulator.Event import Event
 from Packet import Packet, PacketType
 from enum import Enum
 
@@ -13,7 +12,10 @@ class ReliabilityMode(Enum):
 
 class Host(SimulatedEntity):
     
-    def __init__(self, sim, name, mode=ReliabilityMode.NO_RELIABILITY):
+    # track_deliveries: keep the (src, SN) of every DATA packet received, to
+    # report deliveries without duplicates in stats(); memory grows with the
+    # number of packets, so it is off by default
+    def __init__(self, sim, name, mode=ReliabilityMode.NO_RELIABILITY, track_deliveries=False):
         super().__init__(sim, logger_name='Hosts')
         self._name = name
         self._nic = None
@@ -37,6 +39,12 @@ class Host(SimulatedEntity):
         self._receive_buffer = {}
         self._next_expected_seq = 1
         
+        # Statistics
+        self._delivered = set() if track_deliveries else None # (src, SN) of the DATA packets received
+        self._bytes_delivered = 0   # without duplicates
+        self._last_delivery = None  # time of the last new DATA packet received
+        self._retransmissions = 0
+        
     def add_nic(self, nic):
         assert nic.host() == None
         nic.set_host(self)
@@ -46,9 +54,14 @@ class Host(SimulatedEntity):
         assert nic == self._nic
         self.info(f'received {pkt} on {nic}')
         
+        if self._delivered is not None and pkt.type == PacketType.DATA and (pkt.src, pkt.serial_number) not in self._delivered:
+            self._delivered.add((pkt.src, pkt.serial_number))
+            self._bytes_delivered += pkt.size
+            self._last_delivery = self._now()
+        
         if self._mode == ReliabilityMode.ACKNOWLEDGES:
             if pkt.type == PacketType.DATA:
-                ack = Packet(sn=pkt.serial_number, size=pkt.size, type=PacketType.ACK)
+                ack = Packet(sn=pkt.serial_number, size=pkt.size, type=PacketType.ACK, src=pkt.dst, dst=pkt.src)
                 self.info(f'sending ACK for {pkt.serial_number}')
                 self._nic.send(ack)
             elif pkt.type == PacketType.ACK:
@@ -59,7 +72,7 @@ class Host(SimulatedEntity):
         
         elif self._mode == ReliabilityMode.ACKNOWLEDGES_WITH_RETRANSMISSION:
             if pkt.type == PacketType.DATA:
-                ack = Packet(sn=pkt.serial_number, size=pkt.size, type=PacketType.ACK)
+                ack = Packet(sn=pkt.serial_number, size=pkt.size, type=PacketType.ACK, src=pkt.dst, dst=pkt.src)
                 self.info(f'sending ACK for {pkt.serial_number}')
                 self._nic.send(ack)
             elif pkt.type == PacketType.ACK:
@@ -81,7 +94,7 @@ class Host(SimulatedEntity):
                         del self._receive_buffer[self._next_expected_seq]
                         self._next_expected_seq += 1
                     
-                    ack = Packet(sn=self._next_expected_seq - 1, size=pkt.size, type=PacketType.ACK)
+                    ack = Packet(sn=self._next_expected_seq - 1, size=pkt.size, type=PacketType.ACK, src=pkt.dst, dst=pkt.src)
                     self.info(f'sending cumulative ACK {self._next_expected_seq - 1}')
                     self._nic.send(ack)
                 
@@ -89,12 +102,12 @@ class Host(SimulatedEntity):
                     self.info(f'packet {pkt.serial_number} out of order, buffering (expected {self._next_expected_seq})')
                     self._receive_buffer[pkt.serial_number] = pkt
                     
-                    ack = Packet(sn=self._next_expected_seq - 1, size=pkt.size, type=PacketType.ACK)
+                    ack = Packet(sn=self._next_expected_seq - 1, size=pkt.size, type=PacketType.ACK, src=pkt.dst, dst=pkt.src)
                     self.info(f'sending cumulative ACK {self._next_expected_seq - 1}')
                     self._nic.send(ack)
                 else:
                     self.info(f'duplicate packet {pkt.serial_number}, resending ACK')
-                    ack = Packet(sn=self._next_expected_seq - 1, size=pkt.size, type=PacketType.ACK)
+                    ack = Packet(sn=self._next_expected_seq - 1, size=pkt.size, type=PacketType.ACK, src=pkt.dst, dst=pkt.src)
                     self._nic.send(ack)
             
             elif pkt.type == PacketType.ACK:
@@ -123,7 +136,7 @@ class Host(SimulatedEntity):
                         del self._receive_buffer[self._next_expected_seq]
                         self._next_expected_seq += 1
                     
-                    ack = Packet(sn=self._next_expected_seq - 1, size=pkt.size, type=PacketType.ACK)
+                    ack = Packet(sn=self._next_expected_seq - 1, size=pkt.size, type=PacketType.ACK, src=pkt.dst, dst=pkt.src)
                     self.info(f'sending cumulative ACK {self._next_expected_seq - 1}')
                     self._nic.send(ack)
                 
@@ -131,12 +144,12 @@ class Host(SimulatedEntity):
                     self.info(f'packet {pkt.serial_number} out of order, buffering (expected {self._next_expected_seq})')
                     self._receive_buffer[pkt.serial_number] = pkt
                     
-                    ack = Packet(sn=self._next_expected_seq - 1, size=pkt.size, type=PacketType.ACK)
+                    ack = Packet(sn=self._next_expected_seq - 1, size=pkt.size, type=PacketType.ACK, src=pkt.dst, dst=pkt.src)
                     self.info(f'sending cumulative ACK {self._next_expected_seq - 1}')
                     self._nic.send(ack)
                 else:
                     self.info(f'duplicate packet {pkt.serial_number}, resending ACK')
-                    ack = Packet(sn=self._next_expected_seq - 1, size=pkt.size, type=PacketType.ACK)
+                    ack = Packet(sn=self._next_expected_seq - 1, size=pkt.size, type=PacketType.ACK, src=pkt.dst, dst=pkt.src)
                     self._nic.send(ack)
             
             elif pkt.type == PacketType.ACK:
@@ -162,7 +175,8 @@ class Host(SimulatedEntity):
             if self._timer_active and pkt.serial_number == self._expected_ack:
                 self.info(f'TIMEOUT for {pkt}, retransmitting')
                 self._nic.send(pkt)
-                self._sim.add_event(Event(pkt, self._timeout), self._timeout_delay)
+                self._retransmissions += 1
+                self._sim.schedule(self._timeout, pkt, self._timeout_delay)
         
         elif self._mode == ReliabilityMode.PIPELINING_FIXED_WINDOW:
             if self._timer_active:
@@ -170,6 +184,7 @@ class Host(SimulatedEntity):
                 if self._send_base in self._packets_sent:
                     pkt_to_resend = self._packets_sent[self._send_base]
                     self._nic.send(pkt_to_resend)
+                    self._retransmissions += 1
                     self._start_timer()
         
         elif self._mode == ReliabilityMode.PIPELINING_DYNAMIC_WINDOW:
@@ -182,6 +197,7 @@ class Host(SimulatedEntity):
                 if self._send_base in self._packets_sent:
                     pkt_to_resend = self._packets_sent[self._send_base]
                     self._nic.send(pkt_to_resend)
+                    self._retransmissions += 1
                     self._start_timer()
     
     def _start_timer(self):
@@ -189,7 +205,7 @@ class Host(SimulatedEntity):
             self._timer_active = True
             pkt = self._packets_sent[self._send_base]
             self.info(f'starting timer for packet {self._send_base}')
-            self._sim.add_event(Event(pkt, self._timeout), self._timeout_delay)
+            self._sim.schedule(self._timeout, pkt, self._timeout_delay)
     
     def _send_packets_in_window(self):
         while self._next_seq_num < self._send_base + self._window_size and len(self._packets_to_send) > 0:
@@ -222,7 +238,7 @@ class Host(SimulatedEntity):
                 self._current_packet = pkt
                 self._timer_active = True
                 self.info(f'starting timer for {pkt.serial_number} ({self._timeout_delay}s)')
-                self._sim.add_event(Event(pkt, self._timeout), self._timeout_delay)
+                self._sim.schedule(self._timeout, pkt, self._timeout_delay)
     
     def send(self, pkts):
         if self._mode == ReliabilityMode.NO_RELIABILITY:
@@ -252,5 +268,14 @@ class Host(SimulatedEntity):
         else:
             raise NotImplementedError('This reliability mode is not yet implemented.')
         
+    # delivery statistics are None unless deliveries are tracked
+    def stats(self):
+        return {
+            'delivered': len(self._delivered) if self._delivered is not None else None,
+            'bytes_delivered': self._bytes_delivered if self._delivered is not None else None,
+            'last_delivery': self._last_delivery,
+            'retransmissions': self._retransmissions,
+        }
+        
     def __repr__(self):
         return f'Host({self._name})'
\ No newline at end of file
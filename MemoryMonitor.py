@@ -0,0 +1,116 @@
+from simulator.SimulatedEntity import SimulatedEntity
+from Packet import Packet
+
+import gc
+import tracemalloc
+
+# Opt-in memory instrumentation of a run
+#
+# Samples the number of pending events in the simulator, the depth of the
+# NIC queues, the size of the buffers of the hosts and the number of live
+# Packet objects, and records the peak of each with the simulated time at
+# which it occurred. The monitor is the recorder of the simulator (any
+# previous recorder is still told about every event): a sample is taken
+# just before the first event at or after each multiple of `interval`, and
+# at the end of run(). No event is scheduled, so the run, including its end
+# time, is unchanged.
+#
+# Counting live packets walks the whole heap (gc.get_objects()), so choose
+# the interval accordingly. With trace=True, tracemalloc is started and a
+# snapshot is kept each time the sampled traced memory reaches a new high;
+# the report then lists the top allocation sites at that point. The
+# traced_peak metric is the true peak of traced memory: if the monitor
+# started tracing, it is reset at every sample, so the time of the peak is
+# that of the end of the interval in which it was reached; otherwise it is
+# the peak since tracing was started (or reset) elsewhere. Tracing is
+# stopped at the end of run() (or on stop()) if the monitor started it.
+class MemoryMonitor(SimulatedEntity):
+    
+    METRICS = ['event_queue', 'nic_queues', 'nic_queue_max', 'packets_to_send',
+               'packets_sent', 'receive_buffer', 'live_packets', 'traced_memory', 'traced_peak']
+    
+    def __init__(self, sim, interval, hosts=(), nics=(), trace=False, top=10):
+        super().__init__(sim, logger_name='simulator')
+        self._interval = interval
+        self._hosts = list(hosts)
+        self._nics = list(nics)
+        self._trace = trace
+        self._top = top
+        self.samples = []  # (time, {metric: value})
+        self._peaks = {}   # metric -> (value, time)
+        self._snapshot = None
+        self._started_tracing = False
+        self._previous = None
+        self._next = None  # time of the next sample
+        self._stopped = True
+        
+    def start(self):
+        if self._trace and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        self._stopped = False
+        self._next = None
+        self._previous = self._sim.recorder
+        self._sim.recorder = self
+        
+    def stop(self):
+        if self._stopped:
+            return
+        self._stopped = True
+        if self._sim.recorder is self:
+            self._sim.recorder = self._previous
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+            
+    def record(self, time, callback, ctx):
+        if self._previous is not None:
+            self._previous.record(time, callback, ctx)
+        if self._stopped:
+            return
+        if self._next is None or time >= self._next:
+            self.__sample(executing=1)
+            self._next = (time // self._interval + 1) * self._interval
+            
+    def end(self):
+        if self._previous is not None:
+            self._previous.end()
+        if not self._stopped:
+            self.__sample(executing=0)
+            self.stop()
+            
+    # executing: event popped from the simulator but not run yet
+    def __sample(self, executing):
+        sample = {
+            'event_queue': self._sim.pending() + executing,
+            'nic_queues': sum(nic.queue_depth() for nic in self._nics),
+            'nic_queue_max': max((nic.queue_depth() for nic in self._nics), default=0),
+            'packets_to_send': sum(len(h._packets_to_send) for h in self._hosts),
+            'packets_sent': sum(len(h._packets_sent) for h in self._hosts),
+            'receive_buffer': sum(len(h._receive_buffer) for h in self._hosts),
+            'live_packets': sum(1 for o in gc.get_objects() if type(o) is Packet),
+        }
+        if tracemalloc.is_tracing():
+            sample['traced_memory'], sample['traced_peak'] = tracemalloc.get_traced_memory()
+            if self._started_tracing:
+                tracemalloc.reset_peak()
+            if self._trace and sample['traced_memory'] > self._peaks.get('traced_memory', (0, 0))[0]:
+                self._snapshot = tracemalloc.take_snapshot()
+        now = self._now()
+        self.samples.append((now, sample))
+        for metric, value in sample.items():
+            if metric not in self._peaks or value > self._peaks[metric][0]:
+                self._peaks[metric] = (value, now)
+        self.debug(f'memory sample {sample}')
+        
+    # {metric: {'peak': value, 'at': simulated time}}, plus 'top_allocations'
+    # (at the highest sampled traced memory) when tracing
+    def report(self):
+        report = {metric: {'peak': self._peaks[metric][0], 'at': self._peaks[metric][1]}
+                  for metric in self.METRICS if metric in self._peaks}
+        if self._snapshot is not None:
+            report['top_allocations'] = [str(stat) for stat in self._snapshot.statistics('lineno')[:self._top]]
+        return report
+    
+    def __repr__(self):
+        return f'MemoryMonitor({self._interval}s)'
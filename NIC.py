@@ -1,6 +1,5 @@
 
 from simulator.SimulatedEntity import SimulatedEntity
-from simulator.Event import Event
 
 from random import random
 
@@ -51,11 +50,11 @@ class NIC(SimulatedEntity):
     def __transmit(self, pkt):
         self._transmitting = True
         self.debug(f'transmitting {pkt}, queue depth = {self.queue_depth()}')
-        self._sim.add_event( Event(pkt, self.__transmitted), self.delay_tr(pkt.size) )
+        self._sim.schedule(self.__transmitted, pkt, self.delay_tr(pkt.size))
         if random() < self.__link.lost_prob:
             self.info(f'packet {pkt} lost on link {self.__link}')
             return
-        self._sim.add_event( Event(pkt, self.__link.other(self).__received), self.delay_tr(pkt.size) + self.__link.delay_pr() ) # schedule reception at other end only if the packet is not lost
+        self._sim.schedule(self.__link.other(self).__received, pkt, self.delay_tr(pkt.size) + self.__link.delay_pr()) # schedule reception at other end only if the packet is not lost
         
     def send(self, pkt):
         if self._transmitting:
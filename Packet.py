@@ -6,10 +6,13 @@ class PacketType(Enum):
     
 class Packet:
     
-    def __init__(self, sn, size, type=PacketType.DATA):
+    def __init__(self, sn, size, type=PacketType.DATA, payload=None, src=None, dst=None):
         self.size = size # in bytes
         self.type = type
         self.serial_number = sn
+        self.payload = payload # actual bytes carried, if any (see UDPGateway)
+        self.src = src # names of the source and destination hosts, used by
+        self.dst = dst # routers with a routing table (see Topology)
         
     def __repr__(self):
         return f'Packet({self.type} SN={self.serial_number}, {self.size} bytes)'
\ No newline at end of file
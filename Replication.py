@@ -0,0 +1,189 @@
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from statistics import NormalDist
+import math
+import os
+
+# Adaptive replication of stochastic scenarios
+#
+# Each configuration (keyword parameters of a scenario function, see
+# Scenarios) is replicated with seeds base_seed, base_seed + 1, ... until
+# the confidence interval of every metric is narrow enough, or until
+# max_replications is reached. Replications run in a process pool; their
+# results are folded in seed order, so the outcome does not depend on the
+# number of workers or on the completion order.
+
+
+# Quantile of Student's t distribution with df (integer) degrees of freedom.
+#
+# Cornish-Fisher expansion around the normal quantile (relative error below
+# 1e-6 for df > 30), refined for small df by Newton steps on the exact CDF
+# (finite series, Abramowitz & Stegun 26.7.3-4).
+def t_quantile(p, df):
+    assert 0 < p < 1 and df >= 1
+    if df == 1:
+        return math.tan(math.pi * (p - 0.5))
+    if df == 2:
+        return (2*p - 1) / math.sqrt(2 * p * (1 - p))
+    z = NormalDist().inv_cdf(p)
+    t = (z + (z**3 + z) / (4*df)
+           + (5*z**5 + 16*z**3 + 3*z) / (96*df**2)
+           + (3*z**7 + 19*z**5 + 17*z**3 - 15*z) / (384*df**3)
+           + (79*z**9 + 776*z**7 + 1482*z**5 - 1920*z**3 - 945*z) / (92160*df**4))
+    if df > 30:
+        return t
+    log_norm = math.lgamma((df + 1) / 2) - math.lgamma(df / 2) - 0.5 * math.log(df * math.pi)
+    for _ in range(3):
+        density = math.exp(log_norm - (df + 1) / 2 * math.log1p(t*t / df))
+        t -= (_t_cdf(t, df) - p) / density
+    return t
+
+def _t_cdf(t, df):
+    theta = math.atan(t / math.sqrt(df))
+    c2 = math.cos(theta) ** 2
+    if df % 2 == 1:
+        term, total = 1.0, 1.0
+        for k in range(3, df, 2):
+            term *= c2 * (k - 1) / k
+            total += term
+        a = 2 / math.pi * (theta + math.sin(theta) * math.cos(theta) * total)
+    else:
+        term, total = 1.0, 1.0
+        for k in range(2, df, 2):
+            term *= c2 * (k - 1) / k
+            total += term
+        a = math.sin(theta) * total
+    return (1 + a) / 2
+
+# Running mean and variance of a metric (Welford's algorithm)
+class RunningStats:
+    
+    def __init__(self):
+        self.n = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        
+    def add(self, x):
+        self.n += 1
+        delta = x - self.mean
+        self.mean += delta / self.n
+        self._m2 += delta * (x - self.mean)
+        
+    def variance(self):
+        return self._m2 / (self.n - 1) if self.n > 1 else math.inf
+    
+    # Half width of the confidence interval of the mean (Student's t)
+    def half_width(self, confidence=0.95):
+        if self.n < 2:
+            return math.inf
+        return t_quantile((1 + confidence) / 2, self.n - 1) * math.sqrt(self.variance() / self.n)
+    
+    def interval(self, confidence=0.95):
+        h = self.half_width(confidence)
+        return (self.mean - h, self.mean + h)
+    
+    def __repr__(self):
+        return f'RunningStats(n={self.n}, mean={self.mean:.6g}, var={self.variance():.6g})'
+
+
+class _Configuration:
+    
+    def __init__(self, params, metrics):
+        self.params = params
+        self.stats = {m: RunningStats() for m in metrics}
+        self.submitted = 0
+        self.results = {} # out-of-order results, by replication index
+        self.converged = False
+        self.done = False
+        
+
+class ReplicationRunner:
+    
+    # scenario    : picklable function scenario(seed, **params) -> dict of metrics
+    # metrics     : names of the metrics that must reach the requested precision
+    # rel_width   : maximum width of each confidence interval, relative to the mean
+    # width       : optional dict metric -> maximum absolute width, overriding rel_width
+    # workers     : size of the process pool; 0 runs the replications in-process
+    def __init__(self, scenario, metrics=('completion_time', 'goodput', 'retransmissions'),
+                 confidence=0.95, rel_width=0.05, width=None,
+                 min_replications=10, max_replications=1000, base_seed=0, workers=None):
+        assert min_replications >= 2
+        assert max_replications >= min_replications
+        self._scenario = scenario
+        self._metrics = tuple(metrics)
+        self._confidence = confidence
+        self._rel_width = rel_width
+        self._width = width or {}
+        self._min = min_replications
+        self._max = max_replications
+        self._base_seed = base_seed
+        self._workers = os.cpu_count() if workers is None else workers
+        
+    # Returns one dict per configuration, in order:
+    # {'params': ..., 'replications': n, 'converged': bool, 'stats': {metric: RunningStats}}
+    def run(self, configurations):
+        confs = [_Configuration(dict(p), self._metrics) for p in configurations]
+        if self._workers == 0:
+            for conf in confs:
+                while not conf.done:
+                    self._collect(conf, conf.submitted, self._scenario(self._base_seed + conf.submitted, **conf.params))
+                    conf.submitted += 1
+        else:
+            with ProcessPoolExecutor(self._workers) as pool:
+                self._run_pool(pool, confs)
+        return [{'params': conf.params,
+                 'replications': conf.stats[self._metrics[0]].n,
+                 'converged': conf.converged,
+                 'stats': conf.stats} for conf in confs]
+        
+    def _run_pool(self, pool, confs):
+        pending = {}
+        while True:
+            # keep the pool busy, favouring the configurations with fewest replications
+            while len(pending) < 2 * self._workers:
+                active = [c for c in confs if not c.done and c.submitted < self._max]
+                if len(active) == 0:
+                    break
+                conf = min(active, key=lambda c: c.submitted)
+                future = pool.submit(self._scenario, self._base_seed + conf.submitted, **conf.params)
+                pending[future] = (conf, conf.submitted)
+                conf.submitted += 1
+            if len(pending) == 0:
+                return
+            finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in finished:
+                if future not in pending:
+                    continue # dropped below
+                conf, i = pending.pop(future)
+                if conf.done:
+                    continue
+                self._collect(conf, i, future.result())
+                if conf.done:
+                    # replications still queued for this configuration are
+                    # no longer needed; running ones are left to finish
+                    for f in [f for f, (c, _) in pending.items() if c is conf]:
+                        f.cancel()
+                        del pending[f]
+            
+    def _collect(self, conf, i, result):
+        conf.results[i] = result
+        n = conf.stats[self._metrics[0]].n
+        while not conf.done and n in conf.results:
+            result = conf.results.pop(n)
+            for m in self._metrics:
+                conf.stats[m].add(result[m])
+            n += 1
+            if n >= self._min and self._precise(conf):
+                conf.converged = True
+                conf.done = True
+            elif n >= self._max:
+                conf.done = True
+        if conf.done:
+            conf.results.clear()
+            
+    def _precise(self, conf):
+        for m in self._metrics:
+            s = conf.stats[m]
+            limit = self._width.get(m, self._rel_width * abs(s.mean))
+            if 2 * s.half_width(self._confidence) > limit:
+                return False
+        return True
@@ -0,0 +1,196 @@
+from enum import Enum
+import hashlib
+import inspect
+import json
+import os
+import tempfile
+
+# On-disk cache of scenario results (see Scenarios, Replication)
+#
+# A run is identified by the scenario function, its normalized parameters
+# (defaults applied, enums by name), the seed and a hash of the simulator
+# source code; runs being deterministic, the summary metrics of a run can
+# be reused as long as none of these change.
+#
+# Entries are JSON files named after the key, written atomically (temporary
+# file + rename) so that concurrent workers may share a cache directory.
+# The size of the cache is checked every EVICT_EVERY stores in each process,
+# then the least recently used entries are evicted until it fits in
+# max_bytes (so it may exceed it by up to EVICT_EVERY entries per process
+# in between). With bypass=True, cached results are ignored and recomputed
+# (the fresh results are still stored).
+
+# The results of every scenario are assumed to depend on all the Python
+# sources of these directories (relative to _ROOT), whatever they import
+_ROOT = os.path.dirname(os.path.abspath(__file__))
+_CODE_DIRS = ['.', 'simulator']
+
+EVICT_EVERY = 100
+
+# Number of stores since the last size check, per cache directory; kept per
+# process rather than per ResultCache, since a pickled copy is sent to the
+# workers with every task
+_stores = {}
+
+class ResultCache:
+    
+    def __init__(self, directory, max_bytes=100*2**20, bypass=False):
+        self._directory = directory
+        self._max_bytes = max_bytes
+        self._bypass = bypass
+        self._code_versions = {} # computed once, before being sent to workers
+        os.makedirs(directory, exist_ok=True)
+        
+    # unkeyed: names of the arguments that do not change the results (e.g.
+    # an engine implementation or an observer), left out of the key
+    def key(self, scenario, seed, params, unkeyed=()):
+        bound = inspect.signature(scenario).bind(seed, **params)
+        bound.apply_defaults()
+        arguments = dict(bound.arguments)
+        arguments.pop(next(iter(arguments))) # the seed
+        for name in unkeyed:
+            arguments.pop(name, None)
+        config = {
+            'scenario': f'{scenario.__module__}.{scenario.__qualname__}',
+            'params': _normalize(arguments),
+            'seed': seed,
+            'code': self.code_version(scenario),
+        }
+        return hashlib.sha256(json.dumps(config, sort_keys=True).encode()).hexdigest()
+    
+    # Hash of the sources of the repository and of the module defining the
+    # scenario (which may live elsewhere)
+    def code_version(self, scenario):
+        path = inspect.getsourcefile(scenario)
+        if path not in self._code_versions:
+            root = _ROOT
+            files = []
+            for d in _CODE_DIRS:
+                files += [os.path.join(root, d, f) for f in os.listdir(os.path.join(root, d)) if f.endswith('.py')]
+            files.append(os.path.abspath(path))
+            h = hashlib.sha256()
+            for f in sorted(set(files)):
+                with open(f, 'rb') as src:
+                    h.update(os.path.relpath(f, root).encode())
+                    h.update(src.read())
+            self._code_versions[path] = h.hexdigest()
+        return self._code_versions[path]
+    
+    def _path(self, key):
+        return os.path.join(self._directory, key[:2], key + '.json')
+    
+    def get(self, key):
+        if self._bypass:
+            return None
+        path = self._path(key)
+        try:
+            with open(path) as f:
+                value = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+        try:
+            os.utime(path) # marks the entry as recently used
+        except FileNotFoundError:
+            pass
+        return value
+    
+    def put(self, key, value):
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(value, f)
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+        directory = os.path.abspath(self._directory)
+        _stores[directory] = _stores.get(directory, 0) + 1
+        if _stores[directory] >= EVICT_EVERY:
+            _stores[directory] = 0
+            self.evict()
+            
+    # Removes the least recently used entries until the cache fits in max_bytes
+    def evict(self):
+        entries = sorted(self._entries())
+        size = sum(size for _, _, size in entries)
+        for _, path, entry_size in entries:
+            if size <= self._max_bytes:
+                break
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass # evicted by another worker
+            size -= entry_size
+        
+    # (last use, path, size) of every entry
+    def _entries(self):
+        for d in os.scandir(self._directory):
+            if not d.is_dir():
+                continue
+            for e in os.scandir(d.path):
+                if not e.name.endswith('.json'):
+                    continue
+                try:
+                    st = e.stat()
+                except FileNotFoundError:
+                    continue
+                yield (st.st_mtime, e.path, st.st_size)
+                
+    # Scenario function caching its results, usable with ReplicationRunner;
+    # the code version is computed here, so that the copies of the wrapper
+    # sent to the workers do not hash the sources again.
+    #
+    # unkeyed: see key(); uncached_if: names of arguments (e.g. an observer
+    # that must see the run) with which, when given and not None, the
+    # scenario is always run and its result not stored
+    def wrap(self, scenario, unkeyed=(), uncached_if=()):
+        self.code_version(scenario)
+        return CachedScenario(self, scenario, unkeyed, uncached_if)
+    
+    def __repr__(self):
+        return f'ResultCache({self._directory})'
+
+
+class CachedScenario:
+    
+    def __init__(self, cache, scenario, unkeyed=(), uncached_if=()):
+        self._cache = cache
+        self._scenario = scenario
+        self._unkeyed = tuple(unkeyed)
+        self._uncached_if = tuple(uncached_if)
+        self.hits = 0   # in this process
+        self.misses = 0
+        
+    def __call__(self, seed, **params):
+        if any(params.get(name) is not None for name in self._uncached_if):
+            return self._scenario(seed, **params)
+        key = self._cache.key(self._scenario, seed, params, self._unkeyed)
+        value = self._cache.get(key)
+        if value is not None:
+            self.hits += 1
+            return value
+        self.misses += 1
+        value = self._scenario(seed, **params)
+        self._cache.put(key, value)
+        return value
+    
+
+# JSON-compatible canonical form of scenario parameters; other objects
+# have no stable canonical form (their repr may hold an address, or be
+# shared by objects that differ) and are rejected
+def _normalize(value):
+    if isinstance(value, Enum):
+        return value.name
+    if isinstance(value, dict):
+        return {str(k): _normalize(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v) for v in value]
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return repr(float(value)) # 0 and 0.0 are the same parameter value
+    if isinstance(value, (str, bool)) or value is None:
+        return value
+    if inspect.isclass(value) or inspect.isfunction(value):
+        return f'{value.__module__}.{value.__qualname__}'
+    raise TypeError(f'cannot use a parameter of type {type(value).__name__} in a cache key')
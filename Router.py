@@ -6,13 +6,27 @@ class Router(SimulatedEntity):
         super().__init__(sim, logger_name='Routers')
         self._name = name
         self._nics = []
+        self._routes = {}     # destination name -> NIC
+        self._locator = None  # host name -> name of the router it is attached to
         
     def add_nic(self, nic):
         assert nic.host() == None
         nic.set_host(self)
         self._nics.append(nic)
         
+    def add_route(self, dst, nic):
+        assert nic in self._nics
+        self._routes[dst] = nic
+        
+    # Routes to hosts that are not attached to this router go through the
+    # route to the router they are attached to
+    def set_locator(self, locator):
+        self._locator = locator
+        
     def receive(self, nic, pkt):
+        if len(self._routes) > 0:
+            self.__route(nic, pkt)
+            return
         # Super router : always send through the other NIC
         assert len(self._nics) == 2
         assert nic in self._nics
@@ -21,5 +35,15 @@ class Router(SimulatedEntity):
         other_nic.send(pkt)
         self.debug(f'Queue depth on {other_nic} = {other_nic.queue_depth()}')
         
+    def __route(self, nic, pkt):
+        other_nic = self._routes.get(pkt.dst)
+        if other_nic is None and self._locator is not None:
+            other_nic = self._routes.get(self._locator.get(pkt.dst))
+        if other_nic is None:
+            self.info(f'received {pkt} on {nic}, no route to {pkt.dst}, dropped')
+            return
+        self.info(f'received {pkt} on {nic}, forwarded on {other_nic}')
+        other_nic.send(pkt)
+        
     def __repr__(self):
         return f'Router({self._name})'
\ No newline at end of file
@@ -0,0 +1,71 @@
+from simulator.Simulator import Simulator
+from Packet import Packet
+
+from NIC import NIC
+from Host import Host, ReliabilityMode
+from Router import Router
+
+from Link import Link
+
+import random
+
+# Parameterized scenarios, as functions of a seed and of keyword parameters
+# returning the summary metrics of one run (see Replication)
+
+c = 3e8 # m/s
+
+# The A-R-B chain of the scenario scripts; A sends n_packets to B.
+#
+#                 L1            L2
+#            (d_1, s_1)    (d_2, s_2)
+#        [A]-----------[R]------------[B]
+#                R_1           R_2
+#
+# mode is a ReliabilityMode or the name of one; recorder, if any, is
+# attached to the simulator (see ReplayDigest).
+def chain(seed, mode='NO_RELIABILITY', n_packets=50, packet_size=10,
+          R1=1e6, R2=5e5, d1=1000, d2=1000, s1=2/3*c, s2=2/3*c,
+          lost_prob1=0.02, lost_prob2=0.02, queue_size=20, event_set=None, recorder=None):
+    if isinstance(mode, str):
+        mode = ReliabilityMode[mode]
+    random.seed(seed)
+    sim = Simulator() if event_set is None else Simulator(event_set)
+    if recorder is not None:
+        recorder.attach(sim)
+    
+    L1 = Link("L1", distance=d1, speed=s1, lost_prob=lost_prob1)
+    L2 = Link("L2", distance=d2, speed=s2, lost_prob=lost_prob2)
+    
+    nicA = NIC(sim, 'eth0', R1)
+    hostA = Host(sim, 'A', mode=mode)
+    hostA.add_nic(nicA)
+    nicA.attach(L1)
+    
+    nicL1 = NIC(sim, 'eth0', R1)
+    nicL2 = NIC(sim, 'eth1', R2, queue_size=queue_size)
+    router = Router(sim, 'R')
+    router.add_nic(nicL1)
+    router.add_nic(nicL2)
+    nicL1.attach(L1)
+    nicL2.attach(L2)
+    
+    nicB = NIC(sim, 'eth0', R2)
+    hostB = Host(sim, 'B', mode=mode, track_deliveries=True)
+    hostB.add_nic(nicB)
+    nicB.attach(L2)
+    
+    hostA.send([Packet(sn=sn, size=packet_size) for sn in range(1, n_packets + 1)])
+    sim.run()
+    
+    return summary(hostA, hostB, sim.now())
+
+# Summary metrics of a transfer from sender to receiver
+def summary(sender, receiver, end_time):
+    rx = receiver.stats()
+    completion_time = rx['last_delivery'] if rx['last_delivery'] is not None else end_time
+    return {
+        'completion_time': completion_time,
+        'goodput': rx['bytes_delivered'] * 8 / completion_time if completion_time > 0 else 0,
+        'delivered': rx['delivered'],
+        'retransmissions': sender.stats()['retransmissions'],
+    }
@@ -0,0 +1,202 @@
+from Packet import Packet
+
+from NIC import NIC
+from Host import Host, ReliabilityMode
+from Router import Router
+
+from Link import Link
+
+from collections import deque
+import random
+
+c = 3e8 # m/s
+
+# Network of hosts and routers connected by links, with shortest-path
+# routing between hosts.
+#
+# Every host is attached to a single router; routers hold a route to each
+# of their hosts and, through BFS on the router graph, one route (single
+# shortest path, no ECMP) to each router that has hosts attached. Packets
+# are routed on their dst host name (see Router.set_locator).
+class Topology:
+    
+    def __init__(self, sim, mode=ReliabilityMode.NO_RELIABILITY, track_deliveries=False):
+        self._sim = sim
+        self._mode = mode
+        self._track_deliveries = track_deliveries
+        self.hosts = {}
+        self.routers = {}
+        self.links = []
+        self.nics = []
+        self._neighbours = {}  # router name -> [(neighbour router name, NIC)]
+        self._locator = {}     # host name -> router name
+        
+    def add_host(self, name):
+        assert name not in self.hosts and name not in self.routers
+        self.hosts[name] = Host(self._sim, name, mode=self._mode, track_deliveries=self._track_deliveries)
+        return self.hosts[name]
+    
+    def add_router(self, name):
+        assert name not in self.hosts and name not in self.routers
+        self.routers[name] = Router(self._sim, name)
+        self._neighbours[name] = []
+        return self.routers[name]
+    
+    # Connects a host or router to a router with a new link; queue_size
+    # applies to the router NICs (host NICs have infinite queues)
+    def connect(self, a, b, rate, distance=1000, speed=2/3*c, queue_size=0, lost_prob=0):
+        assert b in self.routers, "links must end on a router"
+        link = Link(f'{a}-{b}', distance=distance, speed=speed, lost_prob=lost_prob)
+        self.links.append(link)
+        nics = []
+        for name in (a, b):
+            if name in self.hosts:
+                assert name not in self._locator, "host already attached"
+                nic = NIC(self._sim, 'eth0', rate)
+                self.hosts[name].add_nic(nic)
+            else:
+                router = self.routers[name]
+                nic = NIC(self._sim, f'eth{len(router._nics)}', rate, queue_size=queue_size)
+                router.add_nic(nic)
+            nic.attach(link)
+            nics.append(nic)
+            self.nics.append(nic)
+        if a in self.hosts:
+            self._locator[a] = b
+            self.routers[b].add_route(a, nics[1])
+        else:
+            self._neighbours[a].append((b, nics[0]))
+            self._neighbours[b].append((a, nics[1]))
+        return link
+    
+    def compute_routes(self):
+        for t in sorted(set(self._locator.values())):
+            # BFS from t: the first NIC through which a router is reached
+            # leads back towards t
+            seen = {t}
+            frontier = deque([t])
+            while frontier:
+                u = frontier.popleft()
+                for v, _ in self._neighbours[u]:
+                    if v in seen:
+                        continue
+                    seen.add(v)
+                    frontier.append(v)
+                    for w, nic in self._neighbours[v]:
+                        if w == u:
+                            self.routers[v].add_route(t, nic)
+                            break
+        for router in self.routers.values():
+            router.set_locator(self._locator)
+            
+    # Starts flows, given as (source host name, destination host name)
+    def start(self, flows, n_packets=10, packet_size=10):
+        if self._mode != ReliabilityMode.NO_RELIABILITY:
+            # reliable hosts keep the state of a single transfer in each direction
+            assert len(set(s for s, _ in flows)) == len(flows), "several flows from one host"
+            assert len(set(d for _, d in flows)) == len(flows), "several flows to one host"
+        for src, dst in flows:
+            self.hosts[src].send([Packet(sn=sn, size=packet_size, src=src, dst=dst) for sn in range(1, n_packets + 1)])
+            
+    def __repr__(self):
+        return f'Topology({len(self.hosts)} hosts, {len(self.routers)} routers, {len(self.links)} links)'
+
+
+# Generators
+#
+# rate, distance, lost_prob: parameters of the host access links;
+# core_rate, core_distance, core_lost_prob: those of the links between
+# routers (same as the access links by default); queue_size: size of the
+# queues of the router NICs (0 = infinite); track_deliveries: see Host.
+
+def _core(value, default):
+    return default if value is None else value
+
+# n_pairs hosts on each side of a single bottleneck link
+#
+#   l0 --+             +-- r0
+#   ...  [left]---[right]  ...
+#   l{n-1}-+           +-- r{n-1}
+def dumbbell(sim, n_pairs, mode=ReliabilityMode.NO_RELIABILITY, rate=1e6, distance=1000, lost_prob=0,
+             core_rate=None, core_distance=None, core_lost_prob=None, queue_size=0, track_deliveries=False):
+    topo = Topology(sim, mode, track_deliveries)
+    for r in ('left', 'right'):
+        topo.add_router(r)
+    topo.connect('left', 'right', _core(core_rate, rate), _core(core_distance, distance),
+                 queue_size=queue_size, lost_prob=_core(core_lost_prob, lost_prob))
+    for i in range(n_pairs):
+        for prefix, r in (('l', 'left'), ('r', 'right')):
+            topo.add_host(f'{prefix}{i}')
+            topo.connect(f'{prefix}{i}', r, rate, distance, queue_size=queue_size, lost_prob=lost_prob)
+    topo.compute_routes()
+    return topo
+
+# Chain of n_routers routers, hosts_per_router hosts attached to each
+def parking_lot(sim, n_routers, hosts_per_router, mode=ReliabilityMode.NO_RELIABILITY, rate=1e6, distance=1000,
+                lost_prob=0, core_rate=None, core_distance=None, core_lost_prob=None, queue_size=0, track_deliveries=False):
+    topo = Topology(sim, mode, track_deliveries)
+    for i in range(n_routers):
+        topo.add_router(f'r{i}')
+        if i > 0:
+            topo.connect(f'r{i-1}', f'r{i}', _core(core_rate, rate), _core(core_distance, distance),
+                         queue_size=queue_size, lost_prob=_core(core_lost_prob, lost_prob))
+        for j in range(hosts_per_router):
+            topo.add_host(f'h{i}_{j}')
+            topo.connect(f'h{i}_{j}', f'r{i}', rate, distance, queue_size=queue_size, lost_prob=lost_prob)
+    topo.compute_routes()
+    return topo
+
+# n_hosts hosts attached to a single router
+def star(sim, n_hosts, mode=ReliabilityMode.NO_RELIABILITY, rate=1e6, distance=1000, lost_prob=0, queue_size=0,
+         track_deliveries=False):
+    topo = Topology(sim, mode, track_deliveries)
+    topo.add_router('hub')
+    for i in range(n_hosts):
+        topo.add_host(f'h{i}')
+        topo.connect(f'h{i}', 'hub', rate, distance, queue_size=queue_size, lost_prob=lost_prob)
+    topo.compute_routes()
+    return topo
+
+# k-ary fat tree (k even): k pods of k/2 edge and k/2 aggregation routers,
+# (k/2)^2 core routers and k^3/4 hosts, k/2 per edge router
+def fat_tree(sim, k, mode=ReliabilityMode.NO_RELIABILITY, rate=1e6, distance=1000, lost_prob=0,
+             core_rate=None, core_distance=None, core_lost_prob=None, queue_size=0, track_deliveries=False):
+    assert k % 2 == 0, "k must be even"
+    half = k // 2
+    topo = Topology(sim, mode, track_deliveries)
+    core = dict(rate=_core(core_rate, rate), distance=_core(core_distance, distance),
+                queue_size=queue_size, lost_prob=_core(core_lost_prob, lost_prob))
+    for j in range(half):
+        for l in range(half):
+            topo.add_router(f'c{j}_{l}')
+    for p in range(k):
+        for j in range(half):
+            topo.add_router(f'a{p}_{j}')
+            for l in range(half):
+                topo.connect(f'a{p}_{j}', f'c{j}_{l}', **core)
+        for i in range(half):
+            topo.add_router(f'e{p}_{i}')
+            for j in range(half):
+                topo.connect(f'e{p}_{i}', f'a{p}_{j}', **core)
+            for h in range(half):
+                topo.add_host(f'h{p}_{i}_{h}')
+                topo.connect(f'h{p}_{i}_{h}', f'e{p}_{i}', rate, distance, queue_size=queue_size, lost_prob=lost_prob)
+    topo.compute_routes()
+    return topo
+
+
+# Traffic matrices, as lists of (source, destination) host names
+
+# Every host sends to exactly one other host and receives from exactly one
+def permutation_flows(hosts, rng=random):
+    hosts = list(hosts)
+    assert len(hosts) >= 2
+    order = hosts.copy()
+    rng.shuffle(order)
+    return [(order[i], order[(i + 1) % len(order)]) for i in range(len(order))]
+
+# n_flows flows between random distinct hosts (a host may appear in several)
+def random_flows(hosts, n_flows, rng=random):
+    hosts = list(hosts)
+    assert len(hosts) >= 2
+    return [tuple(rng.sample(hosts, 2)) for _ in range(n_flows)]
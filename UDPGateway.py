@@ -0,0 +1,70 @@
+from simulator.SimulatedEntity import SimulatedEntity
+from Packet import Packet
+
+import asyncio
+
+# Gateway between a real application and the simulated network, to be used
+# in place of a Host with a RealTimeSimulator.
+#
+# Every UDP datagram received on the `listen` address (host, port) is
+# injected in the NIC of the gateway as a DATA packet carrying the datagram;
+# every packet delivered to the gateway by the simulated network is sent to
+# the `peer` address. If no peer is given, the gateway replies to the last
+# application that sent it a datagram.
+class UDPGateway(SimulatedEntity):
+    
+    def __init__(self, sim, name, listen, peer=None):
+        super().__init__(sim, logger_name='Gateways')
+        self._name = name
+        self._nic = None
+        self._listen = listen
+        self._peer = peer
+        self._reply_to = None # last application that sent a datagram
+        self._transport = None
+        self._next_sn = 1
+        
+    def add_nic(self, nic):
+        assert nic.host() == None
+        nic.set_host(self)
+        self._nic = nic
+        
+    async def open(self):
+        loop = asyncio.get_running_loop()
+        self._transport, _ = await loop.create_datagram_endpoint(lambda: _GatewayProtocol(self), local_addr=self._listen)
+        self.info(f'listening on {self._listen[0]}:{self._listen[1]}')
+        
+    def close(self):
+        if self._transport is not None:
+            self._transport.close()
+            self._transport = None
+            
+    def _datagram_received(self, data, addr):
+        self._reply_to = addr
+        pkt = Packet(sn=self._next_sn, size=len(data), payload=data)
+        self._next_sn += 1
+        self._sim.inject(self.__inject, pkt)
+        
+    def __inject(self, pkt):
+        self.info(f'sends {pkt} on {self._nic}')
+        self._nic.send(pkt)
+        
+    def receive(self, nic, pkt):
+        assert nic == self._nic
+        peer = self._peer if self._peer is not None else self._reply_to
+        if pkt.payload is None or peer is None or self._transport is None:
+            self.info(f'received {pkt} on {nic}, no application to deliver to')
+            return
+        self.info(f'received {pkt} on {nic}, delivered to {peer[0]}:{peer[1]}')
+        self._transport.sendto(pkt.payload, peer)
+        
+    def __repr__(self):
+        return f'UDPGateway({self._name})'
+
+
+class _GatewayProtocol(asyncio.DatagramProtocol):
+    
+    def __init__(self, gateway):
+        self._gateway = gateway
+        
+    def datagram_received(self, data, addr):
+        self._gateway._datagram_received(data, addr)
@@ -0,0 +1,56 @@
+from simulator.HeapEventSet import HeapEventSet
+from simulator.CalendarQueue import CalendarQueue
+from simulator.ReplayDigest import ReplayDigest, first_divergence
+import Scenarios
+
+import random
+import sys
+import time
+
+# Compares the event-set backends of the simulator.
+#
+# 1. "hold" model: N pending events, then N times pop the earliest event
+#    and schedule a new one, with delays drawn from the few distinct values
+#    found in the scenarios (NIC transmission + propagation, retransmission
+#    timeout). Reports the mean cost of a pop+push.
+# 2. the pipelining scenario run with each backend must yield exactly the
+#    same sequence of events.
+#
+# Usage: python benchmark_event_sets.py [N ...]   (default: 100000 1000000)
+
+BACKENDS = [HeapEventSet, CalendarQueue]
+
+def hold(event_set, n, delays, seed=1):
+    rng = random.Random(seed)
+    q = event_set()
+    now = 0
+    num = 0
+    for _ in range(n):
+        q.push((now + rng.choice(delays) * rng.random(), num, None, None))
+        num += 1
+    start = time.perf_counter()
+    for _ in range(n):
+        now = q.pop()[0]
+        q.push((now + rng.choice(delays), num, None, None))
+        num += 1
+    return (time.perf_counter() - start) / n
+
+def scenario_trace(event_set):
+    digest = ReplayDigest(keep_events=True)
+    Scenarios.chain(2147483611, mode='PIPELINING_DYNAMIC_WINDOW', n_packets=500, R1=5e6, queue_size=10,
+                    event_set=event_set, recorder=digest)
+    return digest
+
+if __name__ == '__main__':
+    sizes = [int(a) for a in sys.argv[1:]] or [100000, 1000000]
+    delays = [10*8/5e6 + 1000/2e8, 10*8/5e5 + 1000/2e8, 0.1]
+    
+    for n in sizes:
+        for backend in BACKENDS:
+            print(f'{backend.__name__:>14} N={n:>8}: {hold(backend, n, delays)*1e9:8.0f} ns per pop+push')
+    
+    traces = [scenario_trace(backend) for backend in BACKENDS]
+    for backend, trace in zip(BACKENDS[1:], traces[1:]):
+        divergence = first_divergence(traces[0], trace)
+        assert divergence is None, f'{backend.__name__} diverges from {BACKENDS[0].__name__} at event {divergence}'
+    print(f'pipelining scenario: {traces[0].count} events, identical order with all backends')
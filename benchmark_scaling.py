@@ -0,0 +1,69 @@
+from simulator.Simulator import Simulator
+import Topology
+
+from concurrent.futures import ProcessPoolExecutor
+import math
+import random
+import resource
+import sys
+import time
+
+# Scaling of the simulator with the size of the network
+#
+# For each generator and each target number of nodes (hosts + routers),
+# builds the smallest topology of at least that size, starts a permutation
+# traffic matrix (one flow per host) and runs it to completion. Every point
+# runs in a fresh process, so that the peak resident memory is its own.
+#
+# Usage: python benchmark_scaling.py [N ...]   (default: 10 100 1000 10000)
+
+N_PACKETS = 10    # per flow
+PACKET_SIZE = 100 # bytes
+
+def _dumbbell(sim, n):
+    return Topology.dumbbell(sim, max(1, (n - 2 + 1) // 2), queue_size=50)
+
+def _parking_lot(sim, n):
+    # about sqrt(n)/2 routers, so that paths stay reasonably short
+    routers = max(2, math.isqrt(n) // 2)
+    return Topology.parking_lot(sim, routers, max(1, -(-(n - routers) // routers)), queue_size=50)
+
+def _star(sim, n):
+    return Topology.star(sim, max(2, n - 1), queue_size=50)
+
+def _fat_tree(sim, n):
+    k = 2
+    while k**3 // 4 + 5 * k**2 // 4 < n:
+        k += 2
+    return Topology.fat_tree(sim, k, queue_size=50)
+
+GENERATORS = {'dumbbell': _dumbbell, 'parking_lot': _parking_lot, 'star': _star, 'fat_tree': _fat_tree}
+
+def measure(generator, n, seed=1):
+    random.seed(seed)
+    sim = Simulator()
+    start = time.perf_counter()
+    topo = GENERATORS[generator](sim, n)
+    flows = Topology.permutation_flows(sorted(topo.hosts))
+    topo.start(flows, n_packets=N_PACKETS, packet_size=PACKET_SIZE)
+    built = time.perf_counter()
+    sim.run()
+    end = time.perf_counter()
+    return {
+        'nodes': len(topo.hosts) + len(topo.routers),
+        'flows': len(flows),
+        'events': sim.event_count(),
+        'build': built - start,
+        'run': end - built,
+        'maxrss': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss, # KiB on Linux
+    }
+
+if __name__ == '__main__':
+    sizes = [int(a) for a in sys.argv[1:]] or [10, 100, 1000, 10000]
+    print(f"{'topology':>12} {'nodes':>7} {'flows':>7} {'events':>9} {'build s':>8} {'run s':>8} {'events/s':>10} {'max RSS MiB':>12}")
+    for generator in GENERATORS:
+        for n in sizes:
+            with ProcessPoolExecutor(1) as pool:
+                r = pool.submit(measure, generator, n).result()
+            print(f"{generator:>12} {r['nodes']:>7} {r['flows']:>7} {r['events']:>9} {r['build']:>8.3f} {r['run']:>8.3f} "
+                  f"{r['events'] / r['run']:>10.0f} {r['maxrss'] / 1024:>12.1f}")
@@ -0,0 +1,58 @@
+from simulator.Simulator import Simulator
+from Packet import Packet
+
+from NIC import NIC
+from Host import Host, ReliabilityMode
+from Router import Router
+from MemoryMonitor import MemoryMonitor
+
+from Link import Link
+
+import random
+random.seed(2147483611)
+
+# Memory instrumentation of a long pipelining run on the A-R-B chain:
+# peaks of the event queue, NIC queues, host buffers, live packets and
+# traced memory, sampled every 50 ms of simulated time.
+
+sim = Simulator()
+
+c = 3e8 # m/s
+
+L1 = Link("L1", distance=1000, speed=2/3*c, lost_prob=0.02)
+L2 = Link("L2", distance=1000, speed=2/3*c, lost_prob=0.02)
+
+nicA = NIC(sim, 'eth0', 5e6)
+hostA = Host(sim, 'A', mode=ReliabilityMode.PIPELINING_DYNAMIC_WINDOW)
+hostA.add_nic(nicA)
+nicA.attach(L1)
+
+nicL1 = NIC(sim, 'eth0', 5e6)
+nicL2 = NIC(sim, 'eth1', 5e5, queue_size=10)
+router = Router(sim, 'R')
+router.add_nic(nicL1)
+router.add_nic(nicL2)
+nicL1.attach(L1)
+nicL2.attach(L2)
+
+nicB = NIC(sim, 'eth0', 5e5)
+hostB = Host(sim, 'B', mode=ReliabilityMode.PIPELINING_DYNAMIC_WINDOW)
+hostB.add_nic(nicB)
+nicB.attach(L2)
+
+monitor = MemoryMonitor(sim, interval=0.05, hosts=[hostA, hostB], nics=[nicA, nicL1, nicL2, nicB], trace=True)
+monitor.start()
+
+packet_size = 10  # bytes
+hostA.send([Packet(sn=pkt_sn, size=packet_size) for pkt_sn in range(1, 2001)])
+
+sim.run()
+
+print(f'end of simulation @{sim.now():.6f}, {len(monitor.samples)} samples')
+for metric, value in monitor.report().items():
+    if metric == 'top_allocations':
+        print('top allocations at the highest sampled traced memory:')
+        for line in value:
+            print(f'    {line}')
+    else:
+        print(f"{metric:>16}: peak {value['peak']} @{value['at']:.6f}")
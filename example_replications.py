@@ -0,0 +1,21 @@
+from Replication import ReplicationRunner
+from ResultCache import ResultCache
+import Scenarios
+
+# Mean completion time, goodput and retransmissions of the pipelining modes
+# on the A-R-B chain, for several loss probabilities, each estimated to
+# +/- 10% (95% confidence) with as few seeds as needed. Results are cached
+# in .simcache, so running this again only simulates new configurations.
+
+if __name__ == '__main__':
+    configurations = [{'mode': mode, 'lost_prob1': p, 'lost_prob2': p}
+                      for mode in ['PIPELINING_FIXED_WINDOW', 'PIPELINING_DYNAMIC_WINDOW']
+                      for p in [0.01, 0.02, 0.05]]
+    scenario = ResultCache('.simcache').wrap(Scenarios.chain, unkeyed=('event_set', 'recorder'),
+                                             uncached_if=('recorder',))
+    runner = ReplicationRunner(scenario, rel_width=0.2, max_replications=1000)
+    for r in runner.run(configurations):
+        print(f"{r['params']}: {r['replications']} replications{'' if r['converged'] else ' (not converged)'}")
+        for m, s in r['stats'].items():
+            lo, hi = s.interval()
+            print(f'    {m:>16} = {s.mean:.6g}  [{lo:.6g}, {hi:.6g}]')
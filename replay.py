@@ -0,0 +1,90 @@
+from simulator.HeapEventSet import HeapEventSet
+from simulator.CalendarQueue import CalendarQueue
+from simulator.ReplayDigest import ReplayDigest, first_divergence
+import Scenarios
+
+import json
+import os
+import sys
+
+# Deterministic replay digests of the scenarios
+#
+#   python replay.py record [scenario ...]   stores the golden digests
+#   python replay.py verify [scenario ...]   replays against the golden digests
+#   python replay.py compare [scenario ...]  compares the event-set backends
+#                                            with each other, event by event
+#
+# Each scenario is the configuration of Scenarios.chain equivalent to the
+# scenario script of the same name. Golden digests are stored in
+# replay_digests/<scenario>.json; record them again only after a change
+# that is meant to alter the simulated behavior.
+
+SEED = 2147483611
+
+SCENARIOS = {
+    'example': dict(mode='NO_RELIABILITY'),
+    'scenario_acknowledges': dict(mode='ACKNOWLEDGES'),
+    'scenario_acknowledges_with_retransmission': dict(mode='ACKNOWLEDGES_WITH_RETRANSMISSION'),
+    'scenario_pipelining_fixed_window': dict(mode='PIPELINING_FIXED_WINDOW'),
+    'scenario_pipelining_dynamic_window': dict(mode='PIPELINING_DYNAMIC_WINDOW', R1=5e6, lost_prob1=0,
+                                               lost_prob2=0, queue_size=10),
+}
+
+ENGINES = {'heap': HeapEventSet, 'calendar': CalendarQueue}
+
+DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'replay_digests')
+
+def _path(name):
+    return os.path.join(DIRECTORY, name + '.json')
+
+def run(name, recorder, event_set=None):
+    Scenarios.chain(SEED, event_set=event_set, recorder=recorder, **SCENARIOS[name])
+    return recorder
+
+def record(name):
+    digest = run(name, ReplayDigest(checkpoint=100))
+    os.makedirs(DIRECTORY, exist_ok=True)
+    with open(_path(name), 'w') as f:
+        json.dump(digest.to_dict(), f, indent=1)
+        f.write('\n')
+    print(f'{name}: recorded {digest}')
+    return True
+
+def verify(name):
+    with open(_path(name)) as f:
+        expected = json.load(f)
+    digest = run(name, ReplayDigest(expected=expected))
+    divergence = digest.verify(expected)
+    if divergence is None:
+        print(f'{name}: OK, {digest.count} events')
+        return True
+    first, last = divergence['events']
+    print(f'{name}: DIVERGED within events {first}..{last} ({digest.count} events, {expected["count"]} expected)')
+    for i, event in enumerate(divergence['window'], first):
+        print(f'    #{i} {event}')
+    return False
+
+def compare(name):
+    digests = {engine: run(name, ReplayDigest(keep_events=True), event_set) for engine, event_set in ENGINES.items()}
+    (ref_name, ref), *others = digests.items()
+    ok = True
+    for other_name, other in others:
+        divergence = first_divergence(ref, other)
+        if divergence is None:
+            print(f'{name}: {ref_name} == {other_name}, {ref.count} events')
+            continue
+        ok = False
+        i, a, b = divergence
+        print(f'{name}: {ref_name} != {other_name}, first divergent event #{i}')
+        print(f'    {ref_name:>10}: {a}')
+        print(f'    {other_name:>10}: {b}')
+    return ok
+
+if __name__ == '__main__':
+    commands = {'record': record, 'verify': verify, 'compare': compare}
+    if len(sys.argv) < 2 or sys.argv[1] not in commands:
+        print(f'usage: python replay.py {"|".join(commands)} [scenario ...]')
+        sys.exit(2)
+    names = sys.argv[2:] or list(SCENARIOS)
+    results = [commands[sys.argv[1]](name) for name in names]
+    sys.exit(0 if all(results) else 1)
@@ -0,0 +1,82 @@
+from simulator.RealTimeSimulator import RealTimeSimulator
+
+from NIC import NIC
+from Router import Router
+from UDPGateway import UDPGateway
+
+from Link import Link
+
+import asyncio
+import random
+random.seed(2147483611)
+
+import logging
+
+logging.basicConfig(format='[%(levelname)-5s] %(message)s')
+logging.getLogger('simulator').setLevel(logging.INFO)
+logging.getLogger('NIC').setLevel(logging.INFO)
+logging.getLogger('Routers').setLevel(logging.INFO)
+logging.getLogger('Gateways').setLevel(logging.INFO)
+
+# Real applications talking through the simulated A-R-B path, in real time.
+#
+# Datagrams sent to 127.0.0.1:9000 come out of B and are sent to
+# 127.0.0.1:9002; datagrams sent to 127.0.0.1:9001 come out of A and are
+# sent back to the last sender on port 9000. For instance:
+#
+#     nc -u -l 127.0.0.1 9002        # application behind B
+#     nc -u 127.0.0.1 9000           # application behind A
+
+DURATION = 60 # s
+
+sim = RealTimeSimulator(tick=1e-3)
+
+c = 3e8 # m/s
+
+### Topology model ###
+#                 L1            L2
+#            (d_1, s_1)    (d_2, s_2)
+#        [A]-----------[R]------------[B]
+#                R_1           R_2
+
+d1 = 1000  # m
+s1 = 2/3*c # m/s
+R1 = 1e6   # bps
+L1 = Link("L1", distance=d1, speed=s1, lost_prob=0.02) # Link 1 with 2% packet loss
+
+d2 = 1000  # m
+s2 = 2/3*c # m/s
+R2 = 5e5   # bps
+L2 = Link("L2", distance=d2, speed=s2, lost_prob=0.02) # Link 2 with 2% packet loss
+
+# Gateway A replaces Host A
+nicA = NIC(sim, 'eth0', R1)
+gatewayA = UDPGateway(sim, 'A', listen=('127.0.0.1', 9000))
+gatewayA.add_nic(nicA)
+nicA.attach(L1)
+
+nicL1 = NIC(sim, 'eth0', R1)
+nicL2 = NIC(sim, 'eth1', R2, queue_size=20)
+router = Router(sim, 'R')
+router.add_nic(nicL1)
+router.add_nic(nicL2)
+nicL1.attach(L1)
+nicL2.attach(L2)
+
+# Gateway B replaces Host B
+nicB = NIC(sim, 'eth0', R2)
+gatewayB = UDPGateway(sim, 'B', listen=('127.0.0.1', 9001), peer=('127.0.0.1', 9002))
+gatewayB.add_nic(nicB)
+nicB.attach(L2)
+
+async def main():
+    await gatewayA.open()
+    await gatewayB.open()
+    try:
+        await sim.run_realtime(duration=DURATION)
+    finally:
+        gatewayA.close()
+        gatewayB.close()
+    print(sim.lag_report())
+
+asyncio.run(main())
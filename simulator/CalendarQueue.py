@@ -0,0 +1,92 @@
+import heapq
+
+# Calendar queue event set (R. Brown, 1988), a timing wheel whose buckets
+# each cover `width` seconds of simulated time; bucket i is a binary heap of
+# the entries whose time falls in a "day" d with d % nbuckets == i.
+#
+# Buckets stay small as long as the bucket width matches the typical spacing
+# between events; the calendar is resized (and the width re-estimated)
+# whenever the number of events doubles or halves. Simultaneous events all
+# land in one bucket, whose heap keeps them O(log n).
+# Ordering is exactly the one of HeapEventSet: (time, num).
+#
+# Measured with benchmark_event_sets.py (CPython), per pop+push: about the
+# same as HeapEventSet at 1e5 pending events, ~25% faster at 1e6; with 1e5
+# events sharing one deadline it is ~2.5x slower than HeapEventSet. It only
+# pays off for very large event sets; HeapEventSet remains the default.
+class CalendarQueue:
+    
+    _SAMPLE = 25  # number of earliest events used to estimate bucket width
+    
+    def __init__(self, nbuckets=2, width=1.0):
+        self._size = 0
+        self._last = 0  # time of the last popped event, lower bound of all times
+        self._setup(nbuckets, width)
+        
+    def _setup(self, nbuckets, width):
+        self._nbuckets = nbuckets
+        self._width = width
+        self._buckets = [[] for _ in range(nbuckets)]
+        self._day = int(self._last / width)
+        self._grow_at = 2 * nbuckets
+        self._shrink_at = nbuckets // 2 - 2
+        
+    def push(self, entry):
+        heapq.heappush(self._buckets[int(entry[0] / self._width) % self._nbuckets], entry)
+        self._size += 1
+        if self._size > self._grow_at:
+            self._resize(2 * self._nbuckets)
+            
+    def pop(self):
+        return self._take(*self._find())
+    
+    def peek(self):
+        return self._find()[0][0]
+    
+    # bucket holding the earliest entry, and the day of that entry
+    def _find(self):
+        if self._size == 0:
+            raise IndexError('empty CalendarQueue')
+        buckets = self._buckets
+        width = self._width
+        n = self._nbuckets
+        day = self._day
+        for _ in range(n):
+            b = buckets[day % n]
+            if b and int(b[0][0] / width) == day:
+                return b, day
+            day += 1
+        # no event within one full year: fall back to a direct search
+        b = min((b for b in buckets if b), key=lambda b: b[0])
+        return b, int(b[0][0] / width)
+    
+    def _take(self, bucket, day):
+        entry = heapq.heappop(bucket)
+        self._last = entry[0]
+        self._day = day
+        self._size -= 1
+        if self._size < self._shrink_at:
+            self._resize(self._nbuckets // 2)
+        return entry
+    
+    def _resize(self, nbuckets):
+        entries = sorted(e for b in self._buckets for e in b)
+        width = self._estimate_width(entries)
+        self._setup(nbuckets, width)
+        for e in entries:
+            self._buckets[int(e[0] / width) % nbuckets].append(e)
+            
+    def _estimate_width(self, entries):
+        # three times the average separation of the earliest events,
+        # ignoring simultaneous ones
+        gaps = [b[0] - a[0] for a, b in zip(entries[:self._SAMPLE], entries[1:self._SAMPLE])]
+        gaps = [g for g in gaps if g > 0]
+        if len(gaps) == 0:
+            return self._width
+        return 3 * sum(gaps) / len(gaps)
+    
+    def __len__(self):
+        return self._size
+    
+    def __repr__(self):
+        return f'CalendarQueue({self._size} events, {self._nbuckets} buckets of {self._width}s)'
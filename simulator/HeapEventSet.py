@@ -0,0 +1,26 @@
+import heapq
+
+# Default event set of the simulator: a binary heap of entries
+# (time, num, callback, ctx), O(log n) insert and pop.
+#
+# An event set must support push(entry), pop() and peek() returning the
+# smallest entry in (time, num) order, and len().
+class HeapEventSet:
+    
+    def __init__(self):
+        self._heap = []
+        
+    def push(self, entry):
+        heapq.heappush(self._heap, entry)
+        
+    def pop(self):
+        return heapq.heappop(self._heap)
+    
+    def peek(self):
+        return self._heap[0]
+    
+    def __len__(self):
+        return len(self._heap)
+    
+    def __repr__(self):
+        return f'HeapEventSet({len(self._heap)} events)'
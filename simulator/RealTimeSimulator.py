@@ -0,0 +1,124 @@
+import asyncio
+import logging
+
+from simulator.Simulator import Simulator
+from simulator.HeapEventSet import HeapEventSet
+
+# Simulator paced by the wall clock, driven by an asyncio loop
+#
+# Simulated time follows the wall clock (times `speed`). Events are run in
+# batches: every event due within the next `tick` seconds is run at once, so
+# events are executed at most one tick early and the loop wakes up at most
+# once per tick. External entities (see UDPGateway) feed the simulation with
+# inject(), which brings the simulated clock up to the wall clock first.
+# Injections made while run_realtime() is not running (before it starts,
+# or between two runs) are held and scheduled at the start of the next run.
+#
+# When the simulation cannot keep up, events run late; the lag (wall clock
+# minus occurrence time of the event) is reported by lag_report() and logged
+# as a warning at most once per `lag_warning_interval` seconds.
+class RealTimeSimulator(Simulator):
+    
+    def __init__(self, event_set=HeapEventSet, tick=1e-3, speed=1.0, lag_warning_interval=1.0):
+        super().__init__(event_set)
+        self._tick = tick
+        self._speed = speed
+        self._lag_warning_interval = lag_warning_interval
+        self.__logger = logging.getLogger('simulator')
+        
+    def reset(self):
+        super().reset()
+        self._loop = None
+        self._start = None
+        self._wakeup = None
+        self._stopped = False
+        self._running = False
+        self._backlog = []  # injections made while not running
+        self._batches = 0
+        self._late_batches = 0
+        self._max_lag = 0
+        self._max_lag_at = 0
+        self._total_lag = 0
+        self._last_lag_warning = None
+        
+    # Current wall-clock time, on the simulated time scale
+    def wall(self):
+        return (self._loop.time() - self._start) * self._speed
+    
+    # Schedules callback(ctx) to be called now, i.e. at the wall-clock time
+    def inject(self, callback, ctx):
+        if not self._running:
+            self._backlog.append((callback, ctx))
+            return
+        self.run_until(self.wall())
+        self.schedule(callback, ctx, 0)
+        self._wakeup.set()
+        
+    # Runs in real time until `duration` simulated seconds have elapsed,
+    # or until stop() is called when duration is None
+    async def run_realtime(self, duration=None):
+        self._loop = asyncio.get_running_loop()
+        self._start = self._loop.time() - self.now() / self._speed
+        self._wakeup = asyncio.Event()
+        self._stopped = False
+        self._running = True
+        for callback, ctx in self._backlog:
+            self.schedule(callback, ctx, 0)
+        self._backlog = []
+        self.__logger.debug(f'running in real time...')
+        try:
+            q = self._queue
+            while not self._stopped:
+                wall = self.wall()
+                horizon = wall + self._tick
+                if duration is not None:
+                    if wall >= duration:
+                        self.run_until(duration)
+                        break
+                    horizon = min(horizon, duration)
+                if len(q) > 0 and q.peek()[0] <= horizon:
+                    self._record_lag(wall, q.peek()[0])
+                    self.run_until(horizon)
+                    continue
+                timeout = None
+                if len(q) > 0:
+                    timeout = (q.peek()[0] - wall) / self._speed
+                if duration is not None:
+                    remaining = (duration - wall) / self._speed
+                    timeout = remaining if timeout is None else min(timeout, remaining)
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            self._running = False
+        self.__logger.debug('terminated.')
+        
+    def stop(self):
+        self._stopped = True
+        if self._wakeup is not None:
+            self._wakeup.set()
+        
+    def _record_lag(self, wall, time):
+        self._batches += 1
+        lag = wall - time
+        if lag <= self._tick:
+            return
+        self._late_batches += 1
+        self._total_lag += lag
+        if lag > self._max_lag:
+            self._max_lag = lag
+            self._max_lag_at = time
+        if self._last_lag_warning is None or wall - self._last_lag_warning >= self._lag_warning_interval:
+            self._last_lag_warning = wall
+            self.__logger.warning(f'@{time:.6f}, simulator lagging {lag*1e3:.3f} ms behind wall clock')
+            
+    def lag_report(self):
+        return {
+            'batches': self._batches,
+            'late_batches': self._late_batches,
+            'max_lag': self._max_lag,
+            'max_lag_at': self._max_lag_at,
+            'mean_lag': self._total_lag / self._late_batches if self._late_batches > 0 else 0,
+        }
@@ -0,0 +1,107 @@
+import hashlib
+
+# Rolling digest of the stream of events executed by a simulator, used to
+# check that a modified engine still executes exactly the same events, in
+# the same order and at the same times, as the reference one.
+#
+# Each event is described by its time (exact float repr), the callback
+# (qualified name and owner entity) and, for packets, the serial number and
+# type of the context. The digest after event i hashes events 0..i; the
+# digest every `checkpoint` events is kept.
+#
+# With expected checkpoints (from a golden digest, see to_dict), the events
+# since the previous checkpoint are kept, so that when a checkpoint does not
+# match the divergent window of events can be reported. With keep_events,
+# every event is kept and two digests can be compared event by event
+# (first_divergence).
+class ReplayDigest:
+    
+    def __init__(self, checkpoint=1000, expected=None, keep_events=False):
+        self._checkpoint = expected['checkpoint'] if expected is not None else checkpoint
+        self._hash = hashlib.sha256()
+        self.count = 0
+        self.checkpoints = []
+        self._expected = expected['checkpoints'] if expected is not None else None
+        self._keep_events = keep_events
+        self.events = []   # all events with keep_events, else the current window
+        self.divergence = None
+        
+    def attach(self, sim):
+        sim.recorder = self
+        return self
+        
+    def record(self, time, callback, ctx):
+        owner = getattr(callback, '__self__', None)
+        if hasattr(ctx, 'serial_number'):
+            event = f'{time!r} {owner} {callback.__qualname__} {ctx.serial_number} {ctx.type.value}'
+        else:
+            event = f'{time!r} {owner} {callback.__qualname__}'
+        self._hash.update(event.encode())
+        self._hash.update(b'\n')
+        self.count += 1
+        if self._keep_events or (self._expected is not None and self.divergence is None):
+            self.events.append(event)
+        if self.count % self._checkpoint == 0:
+            self._add_checkpoint()
+            
+    def end(self):
+        pass
+    
+    def _add_checkpoint(self):
+        digest = self._hash.hexdigest()
+        i = len(self.checkpoints)
+        self.checkpoints.append(digest)
+        if self._expected is None or self.divergence is not None:
+            return
+        expected = self._expected[i] if i < len(self._expected) else None
+        if digest != expected:
+            start = i * self._checkpoint
+            self.divergence = {
+                'events': (start, self.count),
+                'expected': expected,
+                'actual': digest,
+                'window': self.events[start - self.count:],
+            }
+        if not self._keep_events:
+            self.events = []
+            
+    def digest(self):
+        return self._hash.hexdigest()
+    
+    # To be called at the end of a run replayed against expected digests;
+    # returns None if the runs are identical, else the divergence
+    def verify(self, expected):
+        if self.divergence is None and (self.count != expected['count'] or self.digest() != expected['digest']):
+            # all the checkpoints matched: divergence in the last partial window
+            start = len(self.checkpoints) * self._checkpoint
+            self.divergence = {
+                'events': (start, self.count),
+                'expected': expected['digest'],
+                'actual': self.digest(),
+                'window': self.events[start - self.count:] if self.count > start else [],
+            }
+        return self.divergence
+    
+    def to_dict(self):
+        return {
+            'count': self.count,
+            'digest': self.digest(),
+            'checkpoint': self._checkpoint,
+            'checkpoints': self.checkpoints,
+        }
+    
+    def __repr__(self):
+        return f'ReplayDigest({self.count} events, {self.digest()[:16]})'
+
+
+# First divergent event between two digests recorded with keep_events:
+# None if identical, else (index, event in a, event in b); a missing event
+# (one stream shorter than the other) is None
+def first_divergence(a, b):
+    for i, (ea, eb) in enumerate(zip(a.events, b.events)):
+        if ea != eb:
+            return (i, ea, eb)
+    if len(a.events) != len(b.events):
+        i = min(len(a.events), len(b.events))
+        return (i, a.events[i] if i < len(a.events) else None, b.events[i] if i < len(b.events) else None)
+    return None
@@ -1,37 +1,79 @@
-import queue
 import logging
 
-from simulator.SimulatorEvent import SimulatorEvent
+from simulator.HeapEventSet import HeapEventSet
 
 # Simplest Discrete Event Simulator
+#
+# Pending events are plain tuples (time, num, callback, ctx) kept in an
+# event set (HeapEventSet by default, see also CalendarQueue); num is a
+# per-simulator sequence number that gives a total order over events with
+# the same occurrence time.
 class Simulator:
     
-    _en = 0
-    
-    def __init__(self):
+    def __init__(self, event_set=HeapEventSet):
+        self._event_set_factory = event_set
+        # e.g. a ReplayDigest or a MemoryMonitor: its record(time, callback, ctx)
+        # is called before each event, its end() at the end of run()
+        self.recorder = None
         self.reset()
         self.__logger = logging.getLogger('simulator')
         
+    # Schedules callback(ctx) to be called in delta_t seconds
+    def schedule(self, callback, ctx, delta_t):
+        assert delta_t >= 0
+        self._push((self.__now + delta_t, self._en, callback, ctx))
+        self._en += 1
+        
+    # Compatibility shim for code still building Event objects
     def add_event(self, event, delta_t):
         self.__logger.debug(f'Simulator queueing event {event} in {delta_t} s')
-        assert delta_t >= 0
-        self.q.put( SimulatorEvent(self.__now + delta_t, Simulator._en, event) )
-        Simulator._en += 1
+        self.schedule(event.callback, event.ctx, delta_t)
         
     def run(self):
         self.__logger.debug(f'running...')
-        while self.q.qsize() > 0:
-            self.__logger.debug(f'{self.q.qsize()} remaining events in simulator.')
-            e = self.q.get()
-            self.__now = e.time
-            self.__logger.debug(f'now = {self.__now}')
-            e.event.run()
+        debug = self.__logger.isEnabledFor(logging.DEBUG)
+        q = self._queue
+        pop = q.pop
+        recorder = self.recorder
+        while len(q) > 0:
+            if debug:
+                self.__logger.debug(f'{len(q)} remaining events in simulator.')
+            time, num, callback, ctx = pop()
+            self.__now = time
+            if debug:
+                self.__logger.debug(f'now = {self.__now}')
+            if recorder is not None:
+                recorder.record(time, callback, ctx)
+            callback(ctx)
+        if recorder is not None:
+            recorder.end()
         self.__logger.debug('terminated.')
+        
+    # Runs the events occurring at or before t, then advances the clock to t
+    def run_until(self, t):
+        q = self._queue
+        recorder = self.recorder
+        while len(q) > 0 and q.peek()[0] <= t:
+            time, num, callback, ctx = q.pop()
+            self.__now = time
+            if recorder is not None:
+                recorder.record(time, callback, ctx)
+            callback(ctx)
+        if t > self.__now:
+            self.__now = t
             
     def now(self):
         return self.__now
     
+    def pending(self):
+        return len(self._queue)
+    
+    # Number of events scheduled since the last reset
+    def event_count(self):
+        return self._en
+    
     def reset(self):
         self.__now = 0
-        self.q = queue.PriorityQueue()
-            
+        self._en = 0
+        self._queue = self._event_set_factory()
+        self._push = self._queue.push
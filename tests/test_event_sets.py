@@ -0,0 +1,40 @@
+from simulator.CalendarQueue import CalendarQueue
+from simulator.HeapEventSet import HeapEventSet
+
+import random
+import pytest
+
+
+@pytest.mark.parametrize('seed', range(300))
+def test_calendar_queue_orders_like_heap(seed):
+    rng = random.Random(seed)
+    calendar, heap = CalendarQueue(), HeapEventSet()
+    delays = [0, 0, 1e-5, 3.3e-4, 0.1, rng.random() * 10]
+    now, num = 0, 0
+    sizes = []
+    # phases: grow (many pushes), mixed, then drain (shrink resizes)
+    for push_prob, steps in ((0.9, 400), (0.5, 400), (0.1, 600)):
+        for _ in range(steps):
+            if rng.random() < push_prob or len(heap) == 0:
+                if rng.random() < 0.8:
+                    d = rng.choice(delays)  # shared delays: ties on equal times
+                else:
+                    d = rng.expovariate(rng.choice([1, 1e4]))
+                entry = (now + d, num, None, num)
+                num += 1
+                calendar.push(entry)
+                heap.push(entry)
+            else:
+                assert calendar.peek() == heap.peek()
+                entry = calendar.pop()
+                assert entry == heap.pop()
+                now = entry[0]
+            assert len(calendar) == len(heap)
+            sizes.append(calendar._nbuckets)
+    while len(heap) > 0:
+        assert calendar.peek() == heap.peek()
+        assert calendar.pop() == heap.pop()
+    assert len(calendar) == 0
+    # the calendar grew and shrank
+    assert max(sizes) > sizes[0]
+    assert any(b < a for a, b in zip(sizes, sizes[1:]))
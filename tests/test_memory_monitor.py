@@ -0,0 +1,53 @@
+from simulator.Simulator import Simulator
+from simulator.ReplayDigest import ReplayDigest
+from MemoryMonitor import MemoryMonitor
+import Topology
+
+import random
+import tracemalloc
+
+
+def _star_run(monitor_interval=None, trace=False, recorder=None):
+    random.seed(1)
+    sim = Simulator()
+    if recorder is not None:
+        recorder.attach(sim)
+    topo = Topology.star(sim, 2)
+    monitor = None
+    if monitor_interval is not None:
+        monitor = MemoryMonitor(sim, monitor_interval, hosts=topo.hosts.values(), nics=topo.nics, trace=trace)
+        monitor.start()
+    topo.start([('h0', 'h1')], n_packets=20)
+    sim.run()
+    return sim, monitor
+
+
+def test_monitor_does_not_change_the_run():
+    sim, _ = _star_run()
+    reference = ReplayDigest()
+    _star_run(recorder=reference)
+    digest = ReplayDigest()
+    monitored, monitor = _star_run(monitor_interval=0.05, recorder=digest)
+    assert monitored.now() == sim.now()
+    assert digest.digest() == reference.digest()
+    assert monitored.recorder is digest
+    assert len(monitor.samples) == 2  # first event, end of run
+    assert monitor.report()['nic_queues']['peak'] > 0
+
+
+def test_tracing_stops_with_the_run():
+    assert not tracemalloc.is_tracing()
+    _, monitor = _star_run(monitor_interval=1e-4, trace=True)
+    assert not tracemalloc.is_tracing()
+    report = monitor.report()
+    assert report['traced_peak']['peak'] >= report['traced_memory']['peak']
+    assert 'top_allocations' in report
+
+
+def test_tracing_started_elsewhere_is_left_running():
+    tracemalloc.start()
+    try:
+        _star_run(monitor_interval=1e-3, trace=True)
+        assert tracemalloc.is_tracing()
+    finally:
+        tracemalloc.stop()
@@ -0,0 +1,74 @@
+from simulator.RealTimeSimulator import RealTimeSimulator
+from NIC import NIC
+from Router import Router
+from UDPGateway import UDPGateway
+from Link import Link
+
+import asyncio
+import socket
+
+
+def _free_port():
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def _recv(sock):
+    try:
+        return sock.recv(2048)
+    except BlockingIOError:
+        return None
+
+
+def _chain(sim, listen_a, listen_b, peer_b):
+    L1 = Link('L1', distance=1000, speed=2e8)
+    L2 = Link('L2', distance=1000, speed=2e8)
+    nicA = NIC(sim, 'eth0', 1e6)
+    gatewayA = UDPGateway(sim, 'A', listen=listen_a)
+    gatewayA.add_nic(nicA)
+    nicA.attach(L1)
+    nicL1 = NIC(sim, 'eth0', 1e6)
+    nicL2 = NIC(sim, 'eth1', 1e6)
+    router = Router(sim, 'R')
+    router.add_nic(nicL1)
+    router.add_nic(nicL2)
+    nicL1.attach(L1)
+    nicL2.attach(L2)
+    nicB = NIC(sim, 'eth0', 1e6)
+    gatewayB = UDPGateway(sim, 'B', listen=listen_b, peer=peer_b)
+    gatewayB.add_nic(nicB)
+    nicB.attach(L2)
+    return gatewayA, gatewayB
+
+
+def test_datagrams_outside_of_runs_are_held_for_the_next_run():
+    listen_a = ('127.0.0.1', _free_port())
+    listen_b = ('127.0.0.1', _free_port())
+    receiver = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    receiver.bind(('127.0.0.1', 0))
+    receiver.setblocking(False)
+    sender = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sim = RealTimeSimulator()
+    gatewayA, gatewayB = _chain(sim, listen_a, listen_b, receiver.getsockname())
+    
+    async def main():
+        await gatewayA.open()
+        sender.sendto(b'early', listen_a)  # before run_realtime() starts
+        await asyncio.sleep(0.05)          # delivered to gateway A meanwhile
+        await gatewayB.open()
+        await sim.run_realtime(duration=0.2)
+        assert _recv(receiver) == b'early'
+        sender.sendto(b'between', listen_a) # after run_realtime() returned
+        await asyncio.sleep(0.05)
+        assert _recv(receiver) is None
+        await sim.run_realtime(duration=0.4)
+        gatewayA.close()
+        gatewayB.close()
+    
+    try:
+        asyncio.run(main())
+        assert _recv(receiver) == b'between'
+    finally:
+        receiver.close()
+        sender.close()
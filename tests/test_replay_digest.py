@@ -0,0 +1,62 @@
+from simulator.ReplayDigest import ReplayDigest, first_divergence
+from Packet import Packet
+
+
+def _event(ctx):
+    pass
+
+
+def _run(digest, n, sn_offset=0, changed_at=None):
+    for i in range(n):
+        sn = i + sn_offset + (1000 if i == changed_at else 0)
+        digest.record(i * 1e-3, _event, Packet(sn=sn, size=10))
+    return digest
+
+
+def test_identical_run_verifies():
+    golden = _run(ReplayDigest(checkpoint=10), 25).to_dict()
+    assert _run(ReplayDigest(expected=golden), 25).verify(golden) is None
+
+
+def test_divergence_reports_checkpoint_window():
+    golden = _run(ReplayDigest(checkpoint=10), 35).to_dict()
+    divergence = _run(ReplayDigest(expected=golden), 35, changed_at=13).verify(golden)
+    assert divergence['events'] == (10, 20)
+    assert len(divergence['window']) == 10
+    assert ' 1013 ' in divergence['window'][3]
+
+
+def test_divergence_in_last_partial_window():
+    golden = _run(ReplayDigest(checkpoint=10), 25).to_dict()
+    divergence = _run(ReplayDigest(expected=golden), 25, changed_at=22).verify(golden)
+    assert divergence['events'] == (20, 25)
+    assert len(divergence['window']) == 5
+
+
+def test_shorter_run_is_caught():
+    golden = _run(ReplayDigest(checkpoint=10), 25).to_dict()
+    divergence = _run(ReplayDigest(expected=golden), 20).verify(golden)
+    assert divergence is not None
+    assert divergence['events'] == (20, 20)
+
+
+def test_longer_run_is_caught():
+    golden = _run(ReplayDigest(checkpoint=10), 25).to_dict()
+    divergence = _run(ReplayDigest(expected=golden), 30).verify(golden)
+    assert divergence is not None
+    assert divergence['events'] == (20, 30)
+    assert divergence['expected'] is None
+
+
+def test_first_divergence():
+    a = _run(ReplayDigest(keep_events=True), 5)
+    assert first_divergence(a, _run(ReplayDigest(keep_events=True), 5)) is None
+    i, ea, eb = first_divergence(a, _run(ReplayDigest(keep_events=True), 5, changed_at=2))
+    assert i == 2 and ea != eb
+
+
+def test_first_divergence_on_unequal_lengths():
+    a = _run(ReplayDigest(keep_events=True), 5)
+    b = _run(ReplayDigest(keep_events=True), 7)
+    assert first_divergence(a, b) == (5, None, b.events[5])
+    assert first_divergence(b, a) == (5, b.events[5], None)
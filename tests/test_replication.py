@@ -0,0 +1,38 @@
+from Replication import RunningStats, t_quantile
+
+import math
+import pytest
+
+
+@pytest.mark.parametrize('p, df, expected', [
+    (0.975, 1, 12.706205), (0.975, 2, 4.302653), (0.975, 3, 3.182446),
+    (0.995, 4, 4.604095), (0.975, 9, 2.262157), (0.95, 5, 2.015048),
+    (0.975, 29, 2.045230), (0.975, 31, 2.039513), (0.025, 9, -2.262157),
+])
+def test_t_quantile(p, df, expected):
+    assert t_quantile(p, df) == pytest.approx(expected, abs=1e-6)
+
+
+def test_half_width_uses_student_t():
+    s = RunningStats()
+    for x in range(10):
+        s.add(x)
+    assert s.half_width(0.95) == pytest.approx(2.262157 * math.sqrt(s.variance() / 10), rel=1e-6)
+
+
+def _noisy(seed, scale=1.0):
+    import random
+    rng = random.Random(seed)
+    return {'x': scale * (1 + rng.random())}
+
+
+def test_pool_and_in_process_runs_agree():
+    from Replication import ReplicationRunner
+    
+    configurations = [{'scale': 1.0}, {'scale': 3.0}]
+    results = [ReplicationRunner(_noisy, metrics=('x',), rel_width=0.1, workers=w).run(configurations)
+               for w in (0, 2)]
+    for a, b in zip(*results):
+        assert a['converged'] and b['converged']
+        assert a['replications'] == b['replications']
+        assert a['stats']['x'].mean == b['stats']['x'].mean
@@ -0,0 +1,76 @@
+import ResultCache as result_cache
+from ResultCache import ResultCache
+
+
+def scenario(seed, x=1):
+    return {'value': seed * x}
+
+
+def test_source_edit_changes_key(tmp_path, monkeypatch):
+    root = tmp_path / 'repo'
+    (root / 'simulator').mkdir(parents=True)
+    (root / 'Topology.py').write_text('A = 1\n')
+    (root / 'simulator' / 'Simulator.py').write_text('B = 1\n')
+    monkeypatch.setattr(result_cache, '_ROOT', str(root))
+    
+    def key():
+        return ResultCache(str(tmp_path / 'cache')).key(scenario, 1, {'x': 2})
+    
+    k0 = key()
+    assert key() == k0
+    (root / 'Topology.py').write_text('A = 2\n')
+    k1 = key()
+    assert k1 != k0
+    (root / 'simulator' / 'Simulator.py').write_text('B = 2\n')
+    assert key() not in (k0, k1)
+
+
+def test_defaults_are_normalized(tmp_path):
+    cache = ResultCache(str(tmp_path))
+    assert cache.key(scenario, 1, {}) == cache.key(scenario, 1, {'x': 1.0})
+    assert cache.key(scenario, 1, {}) != cache.key(scenario, 2, {})
+
+
+def test_recorder_bypasses_cache(tmp_path):
+    from simulator.CalendarQueue import CalendarQueue
+    from simulator.ReplayDigest import ReplayDigest
+    import Scenarios
+    
+    cache = ResultCache(str(tmp_path))
+    unkeyed = ('event_set', 'recorder')
+    assert cache.key(Scenarios.chain, 1, {}, unkeyed) == cache.key(Scenarios.chain, 1, {'event_set': CalendarQueue}, unkeyed)
+    run = cache.wrap(Scenarios.chain, unkeyed=unkeyed, uncached_if=('recorder',))
+    first, second = ReplayDigest(), ReplayDigest()
+    run(1, recorder=first)
+    run(1, recorder=second)
+    assert first.count > 0 and second.digest() == first.digest()
+    assert run.hits == 0
+
+
+def test_code_version_travels_with_pickled_wrapper(tmp_path, monkeypatch):
+    import pickle
+    
+    run = pickle.loads(pickle.dumps(ResultCache(str(tmp_path)).wrap(scenario)))
+    monkeypatch.setattr(result_cache, '_CODE_DIRS', [])  # hashing again would give another version
+    cache = ResultCache(str(tmp_path))
+    assert run._cache._code_versions
+    assert run._cache.key(scenario, 1, {}) != cache.key(scenario, 1, {})
+
+
+def test_eviction_every_n_stores(tmp_path, monkeypatch):
+    monkeypatch.setattr(result_cache, 'EVICT_EVERY', 5)
+    monkeypatch.setattr(result_cache, '_stores', {})
+    cache = ResultCache(str(tmp_path), max_bytes=1)
+    run = cache.wrap(scenario)
+    for seed in range(4):
+        run(seed)
+    assert len(list(cache._entries())) == 4
+    run(4)
+    assert len(list(cache._entries())) == 0
+
+
+def test_unnormalizable_parameter_is_rejected(tmp_path):
+    import pytest
+    
+    with pytest.raises(TypeError):
+        ResultCache(str(tmp_path)).key(scenario, 1, {'x': object()})
@@ -0,0 +1,24 @@
+from simulator.Simulator import Simulator
+import Topology
+
+import random
+
+
+def test_deliveries_from_several_flows_into_one_host():
+    random.seed(1)
+    sim = Simulator()
+    topo = Topology.star(sim, 3, track_deliveries=True)
+    topo.start([('h0', 'h2'), ('h1', 'h2')], n_packets=5, packet_size=10)
+    sim.run()
+    stats = topo.hosts['h2'].stats()
+    assert stats['delivered'] == 10
+    assert stats['bytes_delivered'] == 100
+
+
+def test_deliveries_not_tracked_by_default():
+    sim = Simulator()
+    topo = Topology.star(sim, 2)
+    topo.start([('h0', 'h1')], n_packets=5)
+    sim.run()
+    assert topo.hosts['h1']._delivered is None
+    assert topo.hosts['h1'].stats()['delivered'] is None